@@ -8,6 +8,9 @@ ansi_colors: dict[str, str] = {
 
 N, E, S, W = 1, 2, 4, 8
 
+DX = {N: 0, E: 1, S: 0, W: -1}
+DY = {N: -1, E: 0, S: 1, W: 0}
+
 OPPOSITE = {
     N: S,
     S: N,
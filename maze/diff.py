@@ -0,0 +1,325 @@
+"""Wall-grid diffs between variants of the same base maze.
+
+Walls are packed two cells per byte in output-file order (first cell in
+the high nibble), so a whole grid is ``bytes.fromhex`` of its hex rows.
+A diff is one XOR over the packed arrays; each changed cell is stored as
+``cell_index << 4 | xor_mask`` in a ``MazeDelta``.
+
+``python3 -m maze.diff apply`` rebuilds a complete output file from a
+base output file and its deltas: entry and exit come from the base and
+the shortest path is solved again on the variant's walls.
+
+Delta files hold one or more records, each a ``MZD1`` header (width,
+height, CRC32 of the base and target grids, change count) followed by
+the changes as little-endian uint32. Several records in a row form a
+chain; ``compact_deltas`` folds a chain into a single delta.
+"""
+import struct
+import sys
+import zlib
+from typing import BinaryIO, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+from .generator import MazeGenerator
+from .writer import update_output_file
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+MAGIC = b"MZD1"
+HEADER = struct.Struct("<4sHHIII")
+
+# Sizes are uint16 in the header; cell indices share a uint32 with the mask
+MAX_SIDE = 0xFFFF
+MAX_CELLS = 1 << 28
+
+
+class WallGrid(NamedTuple):
+    width: int
+    height: int
+    packed: bytes
+
+
+class MazeDelta(NamedTuple):
+    width: int
+    height: int
+    base_crc: int
+    target_crc: int
+    changes: Tuple[int, ...]
+
+
+def _check_size(width: int, height: int) -> None:
+    if width > MAX_SIDE or height > MAX_SIDE or width * height > MAX_CELLS:
+        raise ValueError(
+            f"Maze of {width}x{height} is too large for a delta "
+            f"(max {MAX_SIDE} per side and {MAX_CELLS} cells)"
+        )
+
+
+def _pack_hex(width: int, height: int, hex_walls: str) -> WallGrid:
+    if len(hex_walls) % 2:
+        hex_walls += "0"
+    return WallGrid(width, height, bytes.fromhex(hex_walls))
+
+
+def grid_from_generator(mg: MazeGenerator) -> WallGrid:
+    hex_walls = "".join(
+        f"{cell.walls:X}" for row in mg.maze for cell in row
+    )
+    return _pack_hex(mg.width, mg.height, hex_walls)
+
+
+def grid_from_output_file(path: str) -> WallGrid:
+    rows: List[str] = []
+
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                break
+            rows.append(line)
+
+    if not rows or any(len(r) != len(rows[0]) for r in rows):
+        raise ValueError(f"Invalid maze in output file: {path}")
+
+    try:
+        return _pack_hex(len(rows[0]), len(rows), "".join(rows))
+    except ValueError:
+        raise ValueError(f"Invalid hex digit in output file: {path}")
+
+
+def as_grid(base: Union[MazeGenerator, WallGrid, str]) -> WallGrid:
+    if isinstance(base, WallGrid):
+        return base
+    if isinstance(base, MazeGenerator):
+        return grid_from_generator(base)
+    return grid_from_output_file(base)
+
+
+def grid_rows(grid: WallGrid) -> List[str]:
+    hex_walls = grid.packed.hex().upper()
+    return [
+        hex_walls[y * grid.width:(y + 1) * grid.width]
+        for y in range(grid.height)
+    ]
+
+
+def load_walls(mg: MazeGenerator, grid: WallGrid) -> None:
+    if (mg.width, mg.height) != (grid.width, grid.height):
+        raise ValueError("Grid size does not match the maze")
+
+    for y, row in enumerate(grid_rows(grid)):
+        for x, digit in enumerate(row):
+            mg.maze[y][x].walls = int(digit, 16)
+
+
+def read_endpoints(path: str) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Entry and exit coordinates from the lines after the blank line."""
+    with open(path, "r") as f:
+        lines = [line.strip() for line in f]
+
+    try:
+        blank = lines.index("")
+        ex, ey = map(int, lines[blank + 1].split(","))
+        xx, xy = map(int, lines[blank + 2].split(","))
+    except (ValueError, IndexError):
+        raise ValueError(f"Missing entry or exit in output file: {path}")
+
+    return (ex, ey), (xx, xy)
+
+
+def grid_to_generator(
+    grid: WallGrid, entry: Tuple[int, int], exit: Tuple[int, int]
+) -> MazeGenerator:
+    for x, y in (entry, exit):
+        if not (0 <= x < grid.width and 0 <= y < grid.height):
+            raise ValueError(f"Point {(x, y)} is outside the maze")
+
+    # The walls alone define the variant: obstacle cells keep all four
+    # walls, so the solver finds the same path without the stencils
+    mg = MazeGenerator(
+        grid.width, grid.height, entry, exit, perfect=True, stencils=[]
+    )
+    load_walls(mg, grid)
+    return mg
+
+
+def _xor_bytes(a: bytes, b: bytes) -> Tuple[List[int], List[int]]:
+    """Returns (byte indices, xor values) of the bytes that differ."""
+    if np is not None:
+        x = np.frombuffer(a, dtype=np.uint8) ^ np.frombuffer(b, dtype=np.uint8)
+        idx = np.flatnonzero(x)
+        return idx.tolist(), x[idx].tolist()
+
+    x = (
+        int.from_bytes(a, "big") ^ int.from_bytes(b, "big")
+    ).to_bytes(len(a), "big")
+    idx = [i for i, v in enumerate(x) if v]
+    return idx, [x[i] for i in idx]
+
+
+def diff_grids(
+    base: Union[MazeGenerator, WallGrid, str],
+    variant: Union[MazeGenerator, WallGrid, str],
+) -> MazeDelta:
+    a = as_grid(base)
+    b = as_grid(variant)
+
+    if (a.width, a.height) != (b.width, b.height):
+        raise ValueError("Cannot diff mazes of different sizes")
+    _check_size(a.width, a.height)
+
+    changes: List[int] = []
+    for i, v in zip(*_xor_bytes(a.packed, b.packed)):
+        if v >> 4:
+            changes.append((2 * i) << 4 | v >> 4)
+        if v & 0xF:
+            changes.append((2 * i + 1) << 4 | v & 0xF)
+
+    return MazeDelta(
+        a.width,
+        a.height,
+        zlib.crc32(a.packed),
+        zlib.crc32(b.packed),
+        tuple(changes),
+    )
+
+
+def apply_delta(
+    base: Union[MazeGenerator, WallGrid, str], delta: MazeDelta
+) -> WallGrid:
+    grid = as_grid(base)
+
+    if (grid.width, grid.height) != (delta.width, delta.height):
+        raise ValueError("Delta size does not match the base maze")
+    if zlib.crc32(grid.packed) != delta.base_crc:
+        raise ValueError("Delta was not made against this base maze")
+
+    cells = grid.width * grid.height
+    packed = bytearray(grid.packed)
+    for change in delta.changes:
+        cell, mask = change >> 4, change & 0xF
+        if cell >= cells:
+            raise ValueError("Delta change out of range")
+        packed[cell >> 1] ^= mask if cell & 1 else mask << 4
+
+    result = WallGrid(grid.width, grid.height, bytes(packed))
+    if zlib.crc32(result.packed) != delta.target_crc:
+        raise ValueError("Delta produced an unexpected maze")
+    return result
+
+
+def compact_deltas(deltas: Sequence[MazeDelta]) -> MazeDelta:
+    """
+    Folds a chain of deltas (each made against the previous result) into
+    one delta from the first base to the last target. Walls toggled an
+    even number of times cancel out.
+    """
+    if not deltas:
+        raise ValueError("Cannot compact an empty chain")
+
+    for prev, cur in zip(deltas, deltas[1:]):
+        if (
+            (cur.width, cur.height) != (prev.width, prev.height)
+            or cur.base_crc != prev.target_crc
+        ):
+            raise ValueError("Deltas do not form a chain")
+
+    masks: Dict[int, int] = {}
+    for delta in deltas:
+        for change in delta.changes:
+            cell = change >> 4
+            masks[cell] = masks.get(cell, 0) ^ (change & 0xF)
+
+    first, last = deltas[0], deltas[-1]
+    return MazeDelta(
+        first.width,
+        first.height,
+        first.base_crc,
+        last.target_crc,
+        tuple(cell << 4 | m for cell, m in sorted(masks.items()) if m),
+    )
+
+
+def materialise(
+    base: Union[MazeGenerator, WallGrid, str], deltas: Sequence[MazeDelta]
+) -> WallGrid:
+    return apply_delta(base, compact_deltas(deltas))
+
+
+def write_deltas(f: BinaryIO, deltas: Sequence[MazeDelta]) -> None:
+    for d in deltas:
+        _check_size(d.width, d.height)
+        f.write(HEADER.pack(
+            MAGIC, d.width, d.height, d.base_crc, d.target_crc, len(d.changes)
+        ))
+        f.write(struct.pack(f"<{len(d.changes)}I", *d.changes))
+
+
+def read_deltas(f: BinaryIO) -> List[MazeDelta]:
+    deltas: List[MazeDelta] = []
+
+    while True:
+        head = f.read(HEADER.size)
+        if not head:
+            return deltas
+        if len(head) < HEADER.size:
+            raise ValueError("Truncated delta header")
+
+        magic, width, height, base_crc, target_crc, count = HEADER.unpack(head)
+        if magic != MAGIC:
+            raise ValueError("Not a maze delta file")
+
+        body = f.read(4 * count)
+        if len(body) < 4 * count:
+            raise ValueError("Truncated delta body")
+
+        changes = struct.unpack(f"<{count}I", body)
+        deltas.append(MazeDelta(width, height, base_crc, target_crc, changes))
+
+
+def main() -> None:
+    usage = (
+        "Usage: python3 -m maze.diff diff base.txt variant.txt out.mzd\n"
+        "       python3 -m maze.diff append chain.mzd prev.txt variant.txt\n"
+        "       python3 -m maze.diff compact chain.mzd out.mzd\n"
+        "       python3 -m maze.diff apply base.txt deltas.mzd out.txt"
+    )
+    args = sys.argv[1:]
+
+    try:
+        if len(args) == 4 and args[0] in ("diff", "append"):
+            if args[0] == "diff":
+                _, base, variant, out = args
+                mode = "wb"
+            else:
+                _, out, base, variant = args
+                mode = "ab"
+            with open(out, mode) as f:
+                write_deltas(f, [diff_grids(base, variant)])
+
+        elif len(args) == 3 and args[0] == "compact":
+            with open(args[1], "rb") as f:
+                delta = compact_deltas(read_deltas(f))
+            with open(args[2], "wb") as f:
+                write_deltas(f, [delta])
+
+        elif len(args) == 4 and args[0] == "apply":
+            _, base, deltas, out = args
+            with open(deltas, "rb") as f:
+                grid = materialise(base, read_deltas(f))
+            entry, exit = read_endpoints(base)
+            update_output_file(grid_to_generator(grid, entry, exit), out)
+
+        else:
+            print(usage)
+            sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,7 +37,7 @@ def display_ascii_real(
                 line += CRYAN + SPACE + RESET
             elif current == (x, y):
                 line += ansi_colors["green"] + SPACE + RESET
-            elif (x, y) in mg.pattern_cells:
+            elif mg.blocked[y][x]:
                 line += RED + SPACE + RESET
             else:
                 line += SPACE
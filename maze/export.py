@@ -0,0 +1,492 @@
+"""Headless export of the generation history (asciicast v2 and GIF).
+
+The maze is modelled as a grid of tiles, (2 * height + 1) rows by
+(2 * width + 1) columns: odd/odd tiles are cells, the others are wall
+segments and corners, the same layout ``display_ascii_real`` prints.
+Replaying ``mg.history`` only touches a handful of tiles per step, so
+both encoders write just those tiles: cursor-addressed ANSI for the
+asciicast, and the changed sub-rectangles of each frame for the GIF.
+"""
+import json
+import pathlib
+import struct
+from typing import BinaryIO, Iterator, List, Set, TextIO, Tuple
+
+from .constants import ansi_colors
+from .generator import MazeGenerator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+OPEN, WALL, BLOCKED, ENTRY, EXIT, CURRENT = range(6)
+
+Tile = Tuple[int, int]
+Box = List[int]  # [r0, c0, r1, c1, changed tiles]
+
+GIF_RGB = {
+    "white": (255, 255, 255),
+    "green": (0, 170, 0),
+    "yellow": (230, 200, 0),
+    "blue": (40, 80, 220),
+    "purple": (150, 50, 180),
+}
+
+
+class AnimationState:
+    def __init__(self, mg: MazeGenerator) -> None:
+        self.mg = mg
+        self.rows = 2 * mg.height + 1
+        self.cols = 2 * mg.width + 1
+
+        self.tiles: List[bytearray] = [
+            bytearray([WALL]) * self.cols for _ in range(self.rows)
+        ]
+        for y in range(mg.height):
+            for x in range(mg.width):
+                self.tiles[2 * y + 1][2 * x + 1] = self._cell_kind(x, y)
+
+        self.current: Tile | None = None
+        self.dirty: Set[Tile] = set()
+
+    def _cell_kind(self, x: int, y: int) -> int:
+        if (x, y) == self.mg.entry:
+            return ENTRY
+        if (x, y) == self.mg.exit:
+            return EXIT
+        if self.mg.blocked[y][x]:
+            return BLOCKED
+        return OPEN
+
+    def _set(self, r: int, c: int, value: int) -> None:
+        if self.tiles[r][c] != value:
+            self.tiles[r][c] = value
+            self.dirty.add((r, c))
+
+    def _update_corner(self, r: int, c: int) -> None:
+        if r in (0, self.rows - 1) or c in (0, self.cols - 1):
+            return
+        t = self.tiles
+        solid = WALL in (t[r - 1][c], t[r + 1][c], t[r][c - 1], t[r][c + 1])
+        self._set(r, c, WALL if solid else OPEN)
+
+    def _mark_current(self, x: int, y: int) -> None:
+        if self.current is not None:
+            cx, cy = self.current
+            self._set(2 * cy + 1, 2 * cx + 1, self._cell_kind(cx, cy))
+        self.current = (x, y)
+        if self._cell_kind(x, y) == OPEN:
+            self._set(2 * y + 1, 2 * x + 1, CURRENT)
+
+    def clear_current(self) -> None:
+        if self.current is not None:
+            cx, cy = self.current
+            self._set(2 * cy + 1, 2 * cx + 1, self._cell_kind(cx, cy))
+            self.current = None
+
+    def apply(self, x: int, y: int, nx: int, ny: int) -> None:
+        # The wall segment sits halfway between both cells
+        r, c = y + ny + 1, x + nx + 1
+        self._set(r, c, OPEN)
+
+        if x == nx:
+            self._update_corner(r, c - 1)
+            self._update_corner(r, c + 1)
+        else:
+            self._update_corner(r - 1, c)
+            self._update_corner(r + 1, c)
+
+        self._mark_current(nx, ny)
+
+    def take_dirty(self) -> Set[Tile]:
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+
+def iter_frames(
+    mg: MazeGenerator, steps_per_frame: int = 1
+) -> Iterator[Tuple[AnimationState, Set[Tile]]]:
+    """
+    Yields (state, changed tiles) once per frame. The first frame has
+    no changes (the caller draws it in full) and the last one clears
+    the current-cell highlight.
+    """
+    if steps_per_frame <= 0:
+        raise ValueError("steps_per_frame must be positive")
+
+    state = AnimationState(mg)
+    yield state, set()
+
+    for i, (x, y, nx, ny, _d) in enumerate(mg.history, 1):
+        state.apply(x, y, nx, ny)
+        if i % steps_per_frame == 0:
+            yield state, state.take_dirty()
+
+    state.clear_current()
+    yield state, state.take_dirty()
+
+
+# --- asciicast v2 ---------------------------------------------------------
+
+def _tile_column(c: int) -> int:
+    # Wall columns are 2 characters wide, cell columns 3
+    return (c // 2) * 5 + (c % 2) * 2
+
+
+def _tile_text(mg: MazeGenerator, kind: int, c: int) -> str:
+    reset = "\033[0m"
+    blank = " " * (3 if c % 2 else 2)
+
+    if kind == WALL:
+        return ansi_colors[mg.color] + blank + reset
+    if kind == BLOCKED:
+        return "\033[41m" + blank + reset
+    if kind == CURRENT:
+        return ansi_colors["green"] + blank + reset
+    if kind == ENTRY:
+        return "EEE"
+    if kind == EXIT:
+        return "XXX"
+    return blank
+
+
+def _ansi_delta(state: AnimationState, dirty: Set[Tile]) -> str:
+    out: List[str] = []
+    last: Tile | None = None
+
+    for r, c in sorted(dirty):
+        # Adjacent tiles on the same row need no cursor move
+        if last != (r, c - 1):
+            out.append(f"\033[{r + 1};{_tile_column(c) + 1}H")
+        out.append(_tile_text(state.mg, state.tiles[r][c], c))
+        last = (r, c)
+
+    return "".join(out)
+
+
+def write_asciicast(
+    mg: MazeGenerator,
+    f: TextIO,
+    steps_per_frame: int = 1,
+    frame_delay: float = 0.05,
+) -> None:
+    frames = iter_frames(mg, steps_per_frame)
+    state, _ = next(frames)
+
+    width = _tile_column(state.cols - 1) + 2
+    header = {"version": 2, "width": width, "height": state.rows + 1}
+    f.write(json.dumps(header) + "\n")
+
+    full = "".join(
+        "".join(_tile_text(mg, state.tiles[r][c], c) for c in range(state.cols))
+        + "\r\n"
+        for r in range(state.rows)
+    )
+    f.write(json.dumps([0.0, "o", "\033[2J\033[H" + full]) + "\n")
+
+    t = 0.0
+    for state, dirty in frames:
+        t += frame_delay
+        if dirty:
+            event = [round(t, 6), "o", _ansi_delta(state, dirty)]
+            f.write(json.dumps(event) + "\n")
+
+    # Leave the cursor below the maze
+    f.write(json.dumps([round(t, 6), "o", f"\033[{state.rows + 1};1H"]) + "\n")
+
+
+# --- animated GIF ---------------------------------------------------------
+
+def _gif_palette(mg: MazeGenerator) -> bytes:
+    colors = [
+        (0, 0, 0),              # OPEN
+        GIF_RGB[mg.color],      # WALL
+        (200, 30, 30),          # BLOCKED
+        (0, 200, 220),          # ENTRY
+        (240, 130, 0),          # EXIT
+        (60, 220, 60),          # CURRENT
+        (0, 0, 0),
+        (0, 0, 0),
+    ]
+    return b"".join(bytes(rgb) for rgb in colors)
+
+
+def _lzw_encode(pixels: bytes, min_code_size: int) -> bytes:
+    clear = 1 << min_code_size
+    eoi = clear + 1
+
+    out = bytearray()
+    acc = 0
+    nbits = 0
+
+    def emit(code: int, size: int) -> None:
+        nonlocal acc, nbits
+        acc |= code << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+
+    # Strings are keyed by (prefix code << 8) | next byte
+    table: dict[int, int] = {}
+    next_code = eoi + 1
+    code_size = min_code_size + 1
+    emit(clear, code_size)
+
+    prefix = pixels[0]
+    for byte in pixels[1:]:
+        key = (prefix << 8) | byte
+        code = table.get(key)
+        if code is not None:
+            prefix = code
+            continue
+
+        emit(prefix, code_size)
+        table[key] = next_code
+        next_code += 1
+        if next_code > (1 << code_size) and code_size < 12:
+            code_size += 1
+        if next_code == 4096:
+            emit(clear, code_size)
+            table.clear()
+            next_code = eoi + 1
+            code_size = min_code_size + 1
+        prefix = byte
+
+    emit(prefix, code_size)
+    emit(eoi, code_size)
+    if nbits:
+        out.append(acc & 0xFF)
+
+    return bytes(out)
+
+
+def _gif_sub_blocks(data: bytes) -> bytes:
+    out = bytearray()
+    for i in range(0, len(data), 255):
+        chunk = data[i:i + 255]
+        out.append(len(chunk))
+        out += chunk
+    out.append(0)
+    return bytes(out)
+
+
+def _rasterize(
+    state: AnimationState, r0: int, c0: int, r1: int, c1: int, scale: int
+) -> bytes:
+    """Pixels (one palette index per byte) for tiles [r0, r1) x [c0, c1)."""
+    if np is not None:
+        grid = np.array(
+            [state.tiles[r][c0:c1] for r in range(r0, r1)], dtype=np.uint8
+        )
+        pixels = np.repeat(np.repeat(grid, scale, axis=0), scale, axis=1)
+        return pixels.tobytes()
+
+    out = bytearray()
+    for r in range(r0, r1):
+        row = b"".join(bytes([v]) * scale for v in state.tiles[r][c0:c1])
+        out += row * scale
+    return bytes(out)
+
+
+# A merged box may cover at most this many tiles per changed tile
+MAX_WASTE = 4
+# Past this many boxes per frame, merge on a coarse grid before pairing
+GREEDY_BOXES = 32
+
+
+def _row_runs(dirty: Set[Tile]) -> List[Box]:
+    runs: List[Box] = []
+    for r, c in sorted(dirty):
+        last = runs[-1] if runs else None
+        if last is not None and last[0] == r and last[3] == c:
+            last[3] += 1
+            last[4] += 1
+        else:
+            runs.append([r, c, r + 1, c + 1, 1])
+    return runs
+
+
+def _dirty_boxes(dirty: Set[Tile]) -> List[Box]:
+    """
+    Groups changed tiles into boxes with one sweep over the row-sorted
+    runs. A run extends the box above it only while the box stays within
+    MAX_WASTE tiles per changed tile, so far-apart changes (the highlight
+    jumping on a DFS backtrack) get separate boxes.
+    """
+    done: List[Box] = []
+    prev: List[Box] = []    # boxes that reached the previous row
+    cur: List[Box] = []     # boxes that reach the current row
+    row = -2
+    j = 0
+
+    for run in _row_runs(dirty):
+        r, c0, _, c1, n = run
+        if r != row:
+            done.extend(prev[j:])
+            if r == row + 1:
+                prev = cur
+            else:
+                done.extend(cur)
+                prev = []
+            cur = []
+            row = r
+            j = 0
+
+        while j < len(prev) and prev[j][3] < c0:
+            done.append(prev[j])
+            j += 1
+
+        if j < len(prev) and prev[j][1] <= c1:
+            box = prev[j]
+            left, right = min(box[1], c0), max(box[3], c1)
+            if (r + 1 - box[0]) * (right - left) <= MAX_WASTE * (box[4] + n):
+                box[1], box[2], box[3], box[4] = left, r + 1, right, box[4] + n
+                cur.append(box)
+                j += 1
+                continue
+
+        cur.append(run)
+
+    done.extend(prev[j:])
+    done.extend(cur)
+    return done
+
+
+def _box_area(b: Box) -> int:
+    return (b[2] - b[0]) * (b[3] - b[1])
+
+
+def _union(a: Box, b: Box) -> Box:
+    return [
+        min(a[0], b[0]), min(a[1], b[1]),
+        max(a[2], b[2]), max(a[3], b[3]),
+        a[4] + b[4],
+    ]
+
+
+def _limit_boxes(boxes: List[Box], limit: int) -> List[Box]:
+    """
+    Merges boxes down to at most ``limit``. Boxes are first bucketed on a
+    grid whose cells double in size (linear per pass) until GREEDY_BOXES
+    are left, then the pair that adds the least area is merged each time.
+    """
+    size = 8
+    while len(boxes) > max(limit, GREEDY_BOXES):
+        buckets: dict[Tile, Box] = {}
+        for box in boxes:
+            key = (box[0] // size, box[1] // size)
+            b = buckets.get(key)
+            if b is None:
+                buckets[key] = list(box)
+            else:
+                b[0], b[1] = min(b[0], box[0]), min(b[1], box[1])
+                b[2], b[3] = max(b[2], box[2]), max(b[3], box[3])
+                b[4] += box[4]
+        boxes = list(buckets.values())
+        size *= 2
+
+    while len(boxes) > limit:
+        best: Tuple[int, int, int] | None = None
+        for i in range(len(boxes)):
+            for k in range(i + 1, len(boxes)):
+                grown = (
+                    _box_area(_union(boxes[i], boxes[k]))
+                    - _box_area(boxes[i]) - _box_area(boxes[k])
+                )
+                if best is None or grown < best[0]:
+                    best = (grown, i, k)
+        assert best is not None
+        _, i, k = best
+        merged = _union(boxes[i], boxes[k])
+        boxes = [b for n, b in enumerate(boxes) if n not in (i, k)]
+        boxes.append(merged)
+
+    return boxes
+
+
+def _gif_frame(
+    f: BinaryIO,
+    state: AnimationState,
+    bbox: Box,
+    scale: int,
+    delay_cs: int,
+) -> None:
+    r0, c0, r1, c1 = bbox[:4]
+    pixels = _rasterize(state, r0, c0, r1, c1, scale)
+
+    # Graphic control: disposal 1 (keep), so sub-rectangles accumulate
+    f.write(b"\x21\xf9\x04\x04" + struct.pack("<H", delay_cs) + b"\x00\x00")
+    f.write(b"\x2c" + struct.pack(
+        "<HHHHB",
+        c0 * scale, r0 * scale,
+        (c1 - c0) * scale, (r1 - r0) * scale,
+        0,
+    ))
+    f.write(b"\x03" + _gif_sub_blocks(_lzw_encode(pixels, 3)))
+
+
+def write_gif(
+    mg: MazeGenerator,
+    f: BinaryIO,
+    steps_per_frame: int = 1,
+    frame_delay: float = 0.05,
+    scale: int = 8,
+) -> None:
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+
+    frames = iter_frames(mg, steps_per_frame)
+    state, _ = next(frames)
+    delay_cs = max(2, round(frame_delay * 100))
+
+    f.write(b"GIF89a")
+    # Global color table of 8 entries, 8 bits per primary
+    f.write(struct.pack(
+        "<HHBBB", state.cols * scale, state.rows * scale, 0xF2, 0, 0
+    ))
+    f.write(_gif_palette(mg))
+    f.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+    _gif_frame(f, state, (0, 0, state.rows, state.cols), scale, delay_cs)
+
+    for state, dirty in frames:
+        if not dirty:
+            continue
+        # Browsers stretch 0-1 cs delays to ~10 cs, so every sub-image
+        # needs at least 2 cs; the frame delay is split among them and
+        # frames with more boxes than that allows are merged down
+        boxes = _limit_boxes(_dirty_boxes(dirty), max(1, delay_cs // 2))
+        share = delay_cs // len(boxes)
+        for i, bbox in enumerate(boxes):
+            if i == len(boxes) - 1:
+                delay = delay_cs - share * i
+            else:
+                delay = share
+            _gif_frame(f, state, bbox, scale, delay)
+
+    f.write(b"\x3b")
+
+
+def export_animation(
+    mg: MazeGenerator,
+    path: str,
+    steps_per_frame: int = 1,
+    frame_delay: float = 0.05,
+) -> None:
+    if steps_per_frame <= 0:
+        raise ValueError("steps_per_frame must be positive")
+
+    suffix = pathlib.Path(path).suffix.lower()
+
+    if suffix == ".cast":
+        with open(path, "w") as f:
+            write_asciicast(mg, f, steps_per_frame, frame_delay)
+    elif suffix == ".gif":
+        with open(path, "wb") as fb:
+            write_gif(mg, fb, steps_per_frame, frame_delay)
+    else:
+        raise ValueError("Animation file must end in .cast or .gif")
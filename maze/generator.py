@@ -1,7 +1,13 @@
-from random import randrange
-from typing import List, Set, Tuple, Optional
+from typing import List, Tuple, Optional
 
-from .constants import N, E, S, W, OPPOSITE
+from .constants import N, E, S, W, DX, DY, OPPOSITE
+from .rng import MazeRNG
+from .stencil import (
+    StencilPlacement,
+    default_placements,
+    is_connected,
+    rasterize,
+)
 
 
 class Cell:
@@ -18,6 +24,7 @@ class MazeGenerator:
         entry: Tuple[int, int],
         exit: Tuple[int, int],
         perfect: bool,
+        stencils: Optional[List[StencilPlacement]] = None,
     ) -> None:
 
         if width <= 0 or height <= 0:
@@ -34,11 +41,14 @@ class MazeGenerator:
         self.color = "white"
         self.perfect = perfect
         self._init_maze()
-        self._42_pattern()
+        self._init_obstacles(stencils)
 
-        if entry in self.pattern_cells or exit in self.pattern_cells:
+        if self.blocked[entry[1]][entry[0]] or self.blocked[exit[1]][exit[0]]:
             raise ValueError("Entry or exit inside pattern")
 
+        if not is_connected(self.blocked, entry, exit):
+            raise ValueError("Pattern separates entry from exit")
+
         self.history: List[Tuple[int, int, int, int, int]] = []
 
     def _init_maze(self) -> None:
@@ -47,33 +57,20 @@ class MazeGenerator:
             for _ in range(self.height)
         ]
 
-    def _42_pattern(self) -> None:
-        self.pattern = [
-            [1, 0, 0, 0, 1, 1, 1],
-            [1, 0, 0, 0, 0, 0, 1],
-            [1, 1, 1, 0, 1, 1, 1],
-            [0, 0, 1, 0, 1, 0, 0],
-            [0, 0, 1, 0, 1, 1, 1],
-        ]
-
-        self.pattern_cells: Set[Tuple[int, int]] = set()
-
-        if self.width >= 9 and self.height >= 7:
-            base_x = (self.width - 7) // 2
-            base_y = (self.height - 5) // 2
-            # print(base_x)
-            # print
-
-            for oy in range(5):
-                for ox in range(7):
-                    if self.pattern[oy][ox] == 1:
-                        mx = base_x + ox
-                        my = base_y + oy
+    def _init_obstacles(
+        self, stencils: Optional[List[StencilPlacement]]
+    ) -> None:
+        # The default 42 pattern is left out of mazes too small for it
+        if stencils is None:
+            if self.width >= 9 and self.height >= 7:
+                stencils = default_placements()
+            else:
+                stencils = []
 
-                        if 0 <= mx < self.width and 0 <= my < self.height:
-                            self.pattern_cells.add((mx, my))
-        else:
-            print ("with should be atleast 9 and for the with atleast 7 for the pattern to be drawn")
+        # blocked[y][x] mirrors maze[y][x]; non-zero means obstacle
+        self.blocked: List[bytearray] = rasterize(
+            self.width, self.height, stencils, (self.entry, self.exit)
+        )
 
     def reset(self) -> None:
         self._init_maze()
@@ -86,129 +83,151 @@ class MazeGenerator:
         c1.walls &= ~d
         c2.walls &= ~OPPOSITE[d]
 
-    def dfs_generator(self) -> None:
+    def dfs_generator(self, rng: MazeRNG) -> None:
         self.history.clear()
 
         stack = [self.entry]
         self.maze[self.entry[1]][self.entry[0]].visited = True
 
+        maze = self.maze
+        blocked = self.blocked
+        width, height = self.width, self.height
+
         while stack:
             x, y = stack[-1]
 
-            neighbors: list[tuple[int, int, int]] = []
-            for d, nx, ny in [
-                (N, x, y - 1),
-                (E, x + 1, y),
-                (S, x, y + 1),
-                (W, x - 1, y),
-            ]:
-                if (
-                    self._in_bounds(nx, ny)
-                    and (nx, ny) not in self.pattern_cells
-                    and not self.maze[ny][nx].visited
-                ):
-                    neighbors.append((d, nx, ny))
+            # Directions only, in N, E, S, W order; no per-check tuples
+            neighbors: list[int] = []
+            if y > 0 and not blocked[y - 1][x] and not maze[y - 1][x].visited:
+                neighbors.append(N)
+            if (
+                x + 1 < width
+                and not blocked[y][x + 1]
+                and not maze[y][x + 1].visited
+            ):
+                neighbors.append(E)
+            if (
+                y + 1 < height
+                and not blocked[y + 1][x]
+                and not maze[y + 1][x].visited
+            ):
+                neighbors.append(S)
+            if x > 0 and not blocked[y][x - 1] and not maze[y][x - 1].visited:
+                neighbors.append(W)
 
             if neighbors:
-                d, nx, ny = neighbors[randrange(len(neighbors))]
-                self._remove_wall(self.maze[y][x], self.maze[ny][nx], d)
-                self.maze[ny][nx].visited = True
+                d = neighbors[rng.randrange(len(neighbors))]
+                nx, ny = x + DX[d], y + DY[d]
+                self._remove_wall(maze[y][x], maze[ny][nx], d)
+                maze[ny][nx].visited = True
                 stack.append((nx, ny))
                 self.history.append((x, y, nx, ny, d))
             else:
                 stack.pop()
 
         if not self.perfect:
-            self._add_loops()
+            self._add_loops(rng)
 
-    def _add_loops(self, delay: float = 0.02) -> None:
+    def _add_loops(self, rng: MazeRNG, delay: float = 0.02) -> None:
         candidates: list[tuple[int, int, int, int, int]] = []
-
-        for y in range(self.height):
-            for x in range(self.width):
-                if (x, y) in self.pattern_cells:
+        maze = self.maze
+        blocked = self.blocked
+        width, height = self.width, self.height
+
+        for y in range(height):
+            row_blocked = blocked[y]
+            for x in range(width):
+                if row_blocked[x]:
                     continue
 
-                for d, nx, ny in [(S, x, y + 1), (E, x + 1, y)]:
-                    if (
-                        self._in_bounds(nx, ny)
-                        and (nx, ny) not in self.pattern_cells
-                        and (self.maze[y][x].walls & d)
-                    ):
-                        candidates.append((x, y, d, nx, ny))
+                walls = maze[y][x].walls
+                if y + 1 < height and not blocked[y + 1][x] and walls & S:
+                    candidates.append((x, y, S, x, y + 1))
+                if x + 1 < width and not row_blocked[x + 1] and walls & E:
+                    candidates.append((x, y, E, x + 1, y))
 
         loops = len(candidates) // 20
         print(loops)
         added = 0
 
         while added < loops and candidates:
-            idx = randrange(len(candidates))
+            idx = rng.randrange(len(candidates))
             x, y, d, nx, ny = candidates[idx]
 
-            cell1_walls = sum(bool(self.maze[y][x].walls & w) for w in [N, E, S, W])
-            cell2_walls = sum(bool(self.maze[ny][nx].walls & w) for w in [N, E, S, W])
-            
+            cell1_walls = bin(maze[y][x].walls).count("1")
+            cell2_walls = bin(maze[ny][nx].walls).count("1")
+
             if cell1_walls >= 2 and cell2_walls >= 2:
-                self._remove_wall(self.maze[y][x], self.maze[ny][nx], d)
+                self._remove_wall(maze[y][x], maze[ny][nx], d)
                 self.history.append((x, y, nx, ny, d))
                 added += 1
 
             candidates.pop(idx)
 
-    def prim_generator(self) -> None:
+    def prim_generator(self, rng: MazeRNG) -> None:
             self.history.clear()
 
             self.maze[self.entry[1]][self.entry[0]].visited = True
 
             neighbors: list[tuple[int, int]] = []
+            maze = self.maze
+            blocked = self.blocked
+            width, height = self.width, self.height
+            # Cells that ever entered the frontier; replaces a list scan
+            queued = [bytearray(width) for _ in range(height)]
 
             x, y = self.entry
 
+            def open_cell(nx: int, ny: int) -> bool:
+                return (
+                    not blocked[ny][nx]
+                    and not maze[ny][nx].visited
+                    and not queued[ny][nx]
+                )
+
             def add_neighbors(x: int, y: int) -> None:
-                for nx, ny in [
-                    (x, y - 1),
-                    (x + 1, y),
-                    (x, y + 1),
-                    (x - 1, y),
-                ]:
-                    if (
-                        self._in_bounds(nx, ny)
-                        and (nx, ny) not in self.pattern_cells
-                        and not self.maze[ny][nx].visited
-                        and (nx, ny) not in neighbors
-                    ):
-                        neighbors.append((nx, ny))
+                # Same N, E, S, W order as before, bounds checked inline
+                if y > 0 and open_cell(x, y - 1):
+                    queued[y - 1][x] = 1
+                    neighbors.append((x, y - 1))
+                if x + 1 < width and open_cell(x + 1, y):
+                    queued[y][x + 1] = 1
+                    neighbors.append((x + 1, y))
+                if y + 1 < height and open_cell(x, y + 1):
+                    queued[y + 1][x] = 1
+                    neighbors.append((x, y + 1))
+                if x > 0 and open_cell(x - 1, y):
+                    queued[y][x - 1] = 1
+                    neighbors.append((x - 1, y))
 
             add_neighbors(x, y)
 
             while neighbors:
-                index = randrange(len(neighbors))
+                index = rng.randrange(len(neighbors))
                 nx, ny = neighbors.pop(index)
 
-                real_neighbors = []
-                for d, nnx, nny in [
-                    (N, nx, ny - 1),
-                    (E, nx + 1, ny),
-                    (S, nx, ny + 1),
-                    (W, nx - 1, ny),
-                ]:
-                    if (
-                        self._in_bounds(nnx, nny)
-                        and (nnx, nny) not in self.pattern_cells
-                        and self.maze[nny][nnx].visited
-                    ):
-                        real_neighbors.append((d, nnx, nny))
+                # Blocked cells are never visited, so visited is enough
+                real_neighbors: list[int] = []
+                if ny > 0 and maze[ny - 1][nx].visited:
+                    real_neighbors.append(N)
+                if nx + 1 < width and maze[ny][nx + 1].visited:
+                    real_neighbors.append(E)
+                if ny + 1 < height and maze[ny + 1][nx].visited:
+                    real_neighbors.append(S)
+                if nx > 0 and maze[ny][nx - 1].visited:
+                    real_neighbors.append(W)
 
                 if real_neighbors:
-                    d, px, py = real_neighbors[randrange(len(real_neighbors))]
+                    d = real_neighbors[rng.randrange(len(real_neighbors))]
+                    px, py = nx + DX[d], ny + DY[d]
 
-                    self._remove_wall(self.maze[ny][nx], self.maze[py][px], d)
+                    self._remove_wall(maze[ny][nx], maze[py][px], d)
 
                     # ✅ FIXED history (same format as DFS)
                     self.history.append((px, py, nx, ny, OPPOSITE[d]))
 
-                self.maze[ny][nx].visited = True
+                maze[ny][nx].visited = True
                 add_neighbors(nx, ny)
 
             if not self.perfect:
-                self._add_loops()
+                self._add_loops(rng)
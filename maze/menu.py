@@ -3,6 +3,7 @@ import os
 from .constants import ansi_colors
 from .display import display_ascii_real, replay
 from .generator import MazeGenerator
+from .rng import MazeRNG
 from .solver import MazeSolver
 from .writer import update_output_file
 
@@ -38,7 +39,7 @@ def color_menu(mg: MazeGenerator) -> None:
 
 
 
-def main_menu(mg: MazeGenerator, output_file: str) -> None:
+def main_menu(mg: MazeGenerator, output_file: str, rng: MazeRNG) -> None:
     solver = MazeSolver(mg)
     show_path = False
     path = None
@@ -56,7 +57,7 @@ def main_menu(mg: MazeGenerator, output_file: str) -> None:
 
         if choice == '1':
             mg.reset()
-            mg.dfs_generator()
+            mg.dfs_generator(rng)
             show_path = False
             path = None
             display_ascii_real(mg)
@@ -64,7 +65,7 @@ def main_menu(mg: MazeGenerator, output_file: str) -> None:
 
         elif choice == '2':
             mg.reset()
-            mg.prim_generator()
+            mg.prim_generator(rng)
             show_path = False
             path = None
             display_ascii_real(mg)
@@ -1,9 +1,11 @@
 from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
-from typing import Tuple
+from typing import List, Tuple
 import pathlib
 import sys
 from typing_extensions import Self
 
+from .stencil import StencilPlacement, parse_stencil_spec
+
 
 class MazeConfig(BaseModel):
     width: int = Field(..., gt=0)
@@ -13,6 +15,7 @@ class MazeConfig(BaseModel):
     output_file: str
     perfect: bool
     seed: int | None = None
+    stencils: List[StencilPlacement] | None = None
 
     @model_validator(mode="after")
     def validate_all(self) -> Self:
@@ -56,6 +59,7 @@ def parse_config_file(path: str) -> MazeConfig:
         "OUTPUT_FILE",
         "PERFECT",
         "SEED",
+        "PATTERN",
     }
 
     with open(path ,"r") as f:
@@ -104,6 +108,11 @@ def parse_config_file(path: str) -> MazeConfig:
                     config_dict["output_file"] = value
                 elif key == "SEED":
                     config_dict["seed"] = int(value)
+                elif key == "PATTERN":
+                    # Stencil files are relative to the config file
+                    config_dict["stencils"] = parse_stencil_spec(
+                        value, str(path_obj.parent)
+                    )
                 # print(**config_dict)
             except ValueError as e:
                 print(f"[ERROR] Invalid value for {key}: {value} ({e})")
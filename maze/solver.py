@@ -16,8 +16,14 @@ class MazeSolver:
         start = self.mg.entry
         end = self.mg.exit
 
+        maze = self.mg.maze
+        blocked = self.mg.blocked
+        width, height = self.mg.width, self.mg.height
+
         queue = deque([start])
-        visited = {start}
+        # visited[y][x] mirrors maze[y][x], like the blocked bitmap
+        visited = [bytearray(width) for _ in range(height)]
+        visited[start[1]][start[0]] = 1
         parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {
             start: None
         }
@@ -35,17 +41,18 @@ class MazeSolver:
             if (x, y) == end:
                 return self._reconstruct_path(parent, end)
 
+            walls = maze[y][x].walls
             for d, dx, dy in directions:
                 nx, ny = x + dx, y + dy
 
                 if (
-                    not self.mg._in_bounds(nx, ny) or 
-                    (nx, ny) in visited or
-                    self.mg.maze[y][x].walls & d or
-                    (nx, ny) in self.mg.pattern_cells
+                    walls & d or
+                    not (0 <= nx < width and 0 <= ny < height) or
+                    visited[ny][nx] or
+                    blocked[ny][nx]
                 ):
                     continue
-                visited.add((nx, ny))
+                visited[ny][nx] = 1
                 parent[(nx, ny)] = (x, y)
                 queue.append((nx, ny))
 
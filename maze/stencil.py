@@ -0,0 +1,265 @@
+"""Obstacle stencils rasterized into a blocked-cell bitmap.
+
+A stencil is a small 0/1 grid read from a text file (``#``/``1``/``X``
+blocked, anything else open) or a PBM image (P1 or P4, black = blocked).
+The ``PATTERN`` config key lists stencils separated by ``;``, each one
+optionally followed by ``@center`` (default), ``@tile`` or ``@x,y``.
+File names are relative to the config file:
+
+    PATTERN = 42@center; logo.pbm@2,3
+"""
+import pathlib
+from collections import deque
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+
+PATTERN_42 = (
+    "#...###",
+    "#.....#",
+    "###.###",
+    "..#.#..",
+    "..#.###",
+)
+
+BLOCKED_CHARS = "#1X"
+
+
+class Stencil(NamedTuple):
+    width: int
+    height: int
+    rows: Tuple[bytes, ...]
+
+
+class StencilPlacement(NamedTuple):
+    stencil: Stencil
+    mode: str  # "center", "tile" or "at"
+    at: Optional[Tuple[int, int]] = None
+
+
+def stencil_from_lines(lines: List[str]) -> Stencil:
+    while lines and not lines[-1].strip():
+        lines = lines[:-1]
+    if not lines:
+        raise ValueError("Stencil is empty")
+
+    width = max(len(line) for line in lines)
+    rows = tuple(
+        bytes(
+            1 if x < len(line) and line[x] in BLOCKED_CHARS else 0
+            for x in range(width)
+        )
+        for line in lines
+    )
+    return Stencil(width, len(rows), rows)
+
+
+def _pbm_tokens(data: bytes) -> List[bytes]:
+    tokens: List[bytes] = []
+    for line in data.splitlines():
+        tokens.extend(line.split(b"#", 1)[0].split())
+    return tokens
+
+
+def load_pbm(data: bytes) -> Stencil:
+    magic = data[:2]
+
+    if magic == b"P1":
+        tokens = _pbm_tokens(data[2:])
+        if len(tokens) < 2:
+            raise ValueError("PBM header is truncated")
+        width, height = int(tokens[0]), int(tokens[1])
+        if width <= 0 or height <= 0:
+            raise ValueError("PBM size must be positive")
+        # P1 pixels may be written with or without separating spaces
+        bits = b"".join(tokens[2:])
+        if len(bits) < width * height:
+            raise ValueError("PBM pixel data is truncated")
+        if bits.strip(b"01"):
+            raise ValueError("P1 pixels must be 0 or 1")
+        rows = tuple(
+            bytes(bits[y * width + x] - ord("0") for x in range(width))
+            for y in range(height)
+        )
+        return Stencil(width, height, rows)
+
+    if magic == b"P4":
+        # Header is magic, width, height; one whitespace byte then raster
+        pos = 2
+        fields: List[int] = []
+        while len(fields) < 2:
+            while data[pos:pos + 1].isspace():
+                pos += 1
+            if data[pos:pos + 1] == b"#":
+                pos = data.index(b"\n", pos) + 1
+                continue
+            start = pos
+            while data[pos:pos + 1].isdigit():
+                pos += 1
+            if start == pos:
+                raise ValueError("PBM header is truncated")
+            fields.append(int(data[start:pos]))
+        width, height = fields
+        if width <= 0 or height <= 0:
+            raise ValueError("PBM size must be positive")
+        pos += 1
+
+        stride = (width + 7) // 8
+        raster = data[pos:pos + stride * height]
+        if len(raster) < stride * height:
+            raise ValueError("PBM pixel data is truncated")
+        rows = tuple(
+            bytes(
+                (raster[y * stride + x // 8] >> (7 - x % 8)) & 1
+                for x in range(width)
+            )
+            for y in range(height)
+        )
+        return Stencil(width, height, rows)
+
+    raise ValueError("Only P1 and P4 PBM files are supported")
+
+
+def load_stencil(source: str, base_dir: str = ".") -> Stencil:
+    if source == "42":
+        return stencil_from_lines(list(PATTERN_42))
+
+    path = pathlib.Path(base_dir) / source
+    if not path.is_file():
+        raise ValueError(f"Stencil file not found: {source}")
+
+    if path.suffix.lower() == ".pbm":
+        return load_pbm(path.read_bytes())
+    return stencil_from_lines(path.read_text().splitlines())
+
+
+def parse_stencil_spec(
+    spec: str, base_dir: str = "."
+) -> List[StencilPlacement]:
+    placements: List[StencilPlacement] = []
+
+    for item in spec.split(";"):
+        item = item.strip()
+        if not item:
+            continue
+
+        source, _, where = item.partition("@")
+        stencil = load_stencil(source.strip(), base_dir)
+        where = where.strip() or "center"
+
+        if where in ("center", "tile"):
+            placements.append(StencilPlacement(stencil, where))
+        else:
+            x, y = map(int, where.split(","))
+            placements.append(StencilPlacement(stencil, "at", (x, y)))
+
+    return placements
+
+
+def default_placements() -> List[StencilPlacement]:
+    return [StencilPlacement(load_stencil("42"), "center")]
+
+
+def _stamp(
+    blocked: List[bytearray], stencil: Stencil, base_x: int, base_y: int
+) -> None:
+    for oy, row in enumerate(stencil.rows):
+        line = blocked[base_y + oy]
+        for ox, bit in enumerate(row):
+            if bit:
+                line[base_x + ox] = 1
+
+
+def _covers(
+    stencil: Stencil, base_x: int, base_y: int, cells: Sequence[Tuple[int, int]]
+) -> bool:
+    for x, y in cells:
+        ox, oy = x - base_x, y - base_y
+        if (
+            0 <= ox < stencil.width and 0 <= oy < stencil.height
+            and stencil.rows[oy][ox]
+        ):
+            return True
+    return False
+
+
+def _no_fit(s: Stencil, where: object, width: int, height: int) -> ValueError:
+    return ValueError(
+        f"Stencil of size {s.width}x{s.height} does not fit "
+        f"{where} in a {width}x{height} maze"
+    )
+
+
+def rasterize(
+    width: int,
+    height: int,
+    placements: List[StencilPlacement],
+    keep_clear: Sequence[Tuple[int, int]] = (),
+) -> List[bytearray]:
+    """
+    Builds the blocked-cell bitmap, one bytearray per row so that
+    blocked[y][x] lines up with maze[y][x]. Stencils that do not fit
+    raise ValueError. Tiled copies that would block a keep_clear cell
+    (entry, exit) are skipped.
+    """
+    blocked = [bytearray(width) for _ in range(height)]
+
+    for p in placements:
+        s = p.stencil
+
+        if p.mode == "tile":
+            # One-cell margin around the maze and corridor between copies
+            ys = range(1, height - s.height, s.height + 1)
+            xs = range(1, width - s.width, s.width + 1)
+            if not ys or not xs:
+                raise _no_fit(s, "as a tile", width, height)
+            for base_y in ys:
+                for base_x in xs:
+                    if not _covers(s, base_x, base_y, keep_clear):
+                        _stamp(blocked, s, base_x, base_y)
+            continue
+
+        if p.mode == "center":
+            base_x = (width - s.width) // 2
+            base_y = (height - s.height) // 2
+        else:
+            assert p.at is not None
+            base_x, base_y = p.at
+
+        if (
+            base_x < 0 or base_y < 0
+            or base_x + s.width > width
+            or base_y + s.height > height
+        ):
+            raise _no_fit(s, f"at {(base_x, base_y)}", width, height)
+        _stamp(blocked, s, base_x, base_y)
+
+    return blocked
+
+
+def is_connected(
+    blocked: List[bytearray],
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+) -> bool:
+    height = len(blocked)
+    width = len(blocked[0])
+    seen = [bytearray(width) for _ in range(height)]
+
+    queue = deque([start])
+    seen[start[1]][start[0]] = 1
+
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == end:
+            return True
+
+        for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+            if (
+                0 <= nx < width and 0 <= ny < height
+                and not blocked[ny][nx]
+                and not seen[ny][nx]
+            ):
+                seen[ny][nx] = 1
+                queue.append((nx, ny))
+
+    return False
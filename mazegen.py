@@ -1,40 +1,62 @@
 # mazegen.py
+import argparse
+import sys
+
 from maze.parser import parse_config_file
 from maze.generator import MazeGenerator
 from maze.display import display_ascii_real
 from maze.menu import main_menu
-import random
+from maze.rng import MazeRNG
+from maze.export import export_animation
+from maze.writer import update_output_file
 
 from maze.debuger import print_maze_debug
 
 def main() -> None:
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python3 mazegen.py config.txt")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(usage="python3 mazegen.py config.txt")
+    parser.add_argument("config_file")
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="write the generation as .cast or .gif and exit (no menu)",
+    )
+    parser.add_argument("--steps-per-frame", type=int, default=1)
+    args = parser.parse_args()
 
-    config_file = sys.argv[1]
-    config = parse_config_file(config_file)  # <- use this
+    config = parse_config_file(args.config_file)  # <- use this
 
     # print(config)
-     # Apply seed ONLY if provided
-    if config.seed is not None:
-        random.seed(config.seed)
-    else:
-        random.seed(None)
-
-    mg = MazeGenerator(
-        width=config.width,
-        height=config.height,
-        entry=config.entry,
-        exit=config.exit,
-        perfect=config.perfect,
-    )
+    # A missing seed gives a fresh stream on every run
+    rng = MazeRNG(config.seed)
+
+    try:
+        mg = MazeGenerator(
+            width=config.width,
+            height=config.height,
+            entry=config.entry,
+            exit=config.exit,
+            perfect=config.perfect,
+            stencils=config.stencils,
+        )
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    mg.dfs_generator(rng)
+
+    if args.export:
+        update_output_file(mg, config.output_file)
+        try:
+            export_animation(mg, args.export, args.steps_per_frame)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        print(f"Animation written to {args.export}")
+        return
 
-    mg.dfs_generator()
     display_ascii_real(mg)
     # print_maze_debug(mg)
-    main_menu(mg, config.output_file)
+    main_menu(mg, config.output_file, rng)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file